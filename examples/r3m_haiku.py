@@ -4,10 +4,10 @@ from absl import app
 import haiku as hk
 import numpy as np
 from PIL import Image
-from safetensors.flax import load_file
 
 from jam import imagenet_util
 from jam.haiku import r3m
+from jam.utils import checkpoint_utils
 
 
 def preprocess_image(im, imsize):
@@ -30,7 +30,9 @@ def main(_):
 
     model = hk.without_apply_rng(hk.transform_with_state(forward))
 
-    state_dict = load_file(f"data/models/r3m/{model_name}/torch_model.safetensors")
+    state_dict = checkpoint_utils.load_safetensors_state_dict(
+        f"data/models/r3m/{model_name}/torch_model.safetensors"
+    )
     params, state = r3m.load_from_torch_checkpoint(state_dict)
 
     x = preprocess_image(image, imsize)
@@ -3,10 +3,10 @@ import os
 from absl import app
 import numpy as np
 from PIL import Image
-from safetensors.flax import load_file
 
 from jam import imagenet_util
 from jam.flax import resnet
+from jam.utils import checkpoint_utils
 
 NUM_CLASSES = 1000
 
@@ -33,7 +33,7 @@ def main(_):
     )
     name = f"resnet{resnet_size}"
     # # N, H, W, C
-    state_dict = load_file(
+    state_dict = checkpoint_utils.load_safetensors_state_dict(
         f"data/models/torchvision/{name}-imagenet1k-v2/torch_model.safetensors"
     )
     restored_variables = resnet.load_from_torch_checkpoint(state_dict)
@@ -4,10 +4,10 @@ from absl import app
 import haiku as hk
 import numpy as np
 from PIL import Image
-from safetensors.flax import load_file
 
 from jam import imagenet_util
 from jam.haiku import resnet
+from jam.utils import checkpoint_utils
 
 NUM_CLASSES = 1000
 
@@ -44,7 +44,7 @@ def main(_):
     label = "bell pepper"
 
     x = preprocess_image(image, 224)
-    state_dict = load_file(
+    state_dict = checkpoint_utils.load_safetensors_state_dict(
         f"data/models/torchvision/{name}-imagenet1k-v2/torch_model.safetensors"
     )
     (params, state) = resnet.load_from_torch_checkpoint(state_dict, name)
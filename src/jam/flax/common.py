@@ -1,10 +1,57 @@
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from flax import linen as nn
 import jax
 import jax.numpy as jnp
 
 
+def quantize_kernel_int8(kernel):
+    """Quantizes a (in, features) kernel to int8 with per-feature scales."""
+    scale = jnp.maximum(jnp.max(jnp.abs(kernel), axis=0), 1e-8) / 127.0
+    quantized = jnp.clip(jnp.round(kernel / scale), -127, 127).astype(jnp.int8)
+    return quantized, scale.astype(jnp.float32)
+
+
+class Int8Dense(nn.Module):
+    """Dense layer with weight-only int8 quantization.
+
+    The kernel is stored as int8 with a per-output-channel scale and
+    dequantized on the fly, so weights use 4x less memory and bandwidth
+    while activations and accumulation stay in ``dtype``. Float kernels are
+    converted with :func:`quantize_kernel_int8`. Fresh initialization
+    quantizes the ``kernel_init`` draw with a fixed scale of 1/127 (the
+    per-channel scale cannot be shared across two params at init time), so
+    it is coherent but coarser than a converted checkpoint.
+    """
+
+    features: int
+    use_bias: bool = True
+    kernel_init: Callable = nn.initializers.lecun_normal()
+    dtype: Any = jnp.float32
+
+    @nn.compact
+    def __call__(self, inputs: jnp.ndarray) -> jnp.ndarray:
+        def init_kernel(key, shape):
+            kernel = self.kernel_init(key, shape, jnp.float32)
+            return jnp.clip(jnp.round(kernel * 127.0), -127, 127).astype(jnp.int8)
+
+        kernel = self.param("kernel", init_kernel, (inputs.shape[-1], self.features))
+        scale = self.param(
+            "scale",
+            nn.initializers.constant(1.0 / 127.0),
+            (self.features,),
+            jnp.float32,
+        )
+        kernel = kernel.astype(self.dtype) * scale.astype(self.dtype)
+        outputs = jnp.dot(inputs, kernel)
+        if self.use_bias:
+            bias = self.param(
+                "bias", nn.initializers.zeros, (self.features,), self.dtype
+            )
+            outputs = outputs + bias
+        return outputs
+
+
 class StochasticDepth(nn.Module):
     """Batchwise Dropout used in EfficientNet, optionally sans rescaling."""
 
@@ -39,10 +86,7 @@ class StochasticDepth(nn.Module):
         if rng is None:
             rng = self.make_rng(self.rng_collection)
 
-        r = jax.random.uniform(rng, [batch_size, 1, 1, 1], dtype=inputs.dtype)
         keep_prob = 1.0 - self.drop_rate
-        binary_tensor = jnp.floor(keep_prob + r)
-        outputs = inputs
-        if self.scale_by_keep:
-            outputs = outputs / keep_prob
-        return outputs * binary_tensor
+        mask = jax.random.bernoulli(rng, keep_prob, [batch_size, 1, 1, 1])
+        scale = 1.0 / keep_prob if self.scale_by_keep else 1.0
+        return jnp.where(mask, inputs * scale, 0.0)
@@ -1,5 +1,9 @@
+from jam.flax.convnext.convert_torch_checkpoint import fold_layernorm_into_block_dense
+from jam.flax.convnext.convert_torch_checkpoint import fuse_layer_scale
 from jam.flax.convnext.convert_torch_checkpoint import load_from_torch_checkpoint
+from jam.flax.convnext.convert_torch_checkpoint import quantize_block_dense_params
 from jam.flax.convnext.convnext import ConvNeXt
+from jam.flax.convnext.convnext import ConvNeXtBlock
 from jam.flax.convnext.convnext import convnext_base
 from jam.flax.convnext.convnext import convnext_large
 from jam.flax.convnext.convnext import convnext_small
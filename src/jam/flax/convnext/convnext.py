@@ -23,55 +23,92 @@ class ConvNeXtBlock(nn.Module):
     layer_scale: float
     stochastic_depth_prob: float
     norm_cls: Any = functools.partial(nn.LayerNorm, epsilon=1e-6)
+    dense_cls: Any = nn.Dense
     activation: Callable[[jnp.ndarray], jnp.ndarray] = lambda x: jax.nn.gelu(
         x, approximate=False
     )
+    # Skip the layer_scale multiply (no layer_scale param); for use with
+    # params transformed by fuse_layer_scale.
+    use_layer_scale: bool = True
+    # Approximate the 7x7 depthwise conv with separable 7x1 + 1x7 convs,
+    # trading 49 taps per pixel for 14. Not loadable from torchvision
+    # checkpoints (the pretrained 7x7 kernels are not separable).
+    separable_depthwise: bool = False
     dtype: Any = jnp.float32
 
     def setup(self) -> None:
-        self.block = nn.Sequential(
-            [
-                nn.Conv(
-                    features=self.dim,
-                    kernel_size=(7, 7),
-                    padding=3,
-                    feature_group_count=self.dim,
-                    use_bias=True,
-                    kernel_init=_default_kernel_init,
-                    name="conv",
-                    dtype=self.dtype,
-                ),
-                self.norm_cls(name="norm"),
-                nn.Dense(
-                    4 * self.dim,
-                    use_bias=True,
-                    kernel_init=_default_kernel_init,
-                    name="dense_0",
-                    dtype=self.dtype,
-                ),
-                self.activation,
-                nn.Dense(
-                    self.dim,
-                    use_bias=True,
-                    kernel_init=_default_kernel_init,
-                    name="dense_1",
-                    dtype=self.dtype,
-                ),
-            ]
+        if self.separable_depthwise:
+            self.conv_h = nn.Conv(
+                features=self.dim,
+                kernel_size=(7, 1),
+                padding=((3, 3), (0, 0)),
+                feature_group_count=self.dim,
+                use_bias=False,
+                kernel_init=_default_kernel_init,
+                name="conv_h",
+                dtype=self.dtype,
+            )
+            self.conv_w = nn.Conv(
+                features=self.dim,
+                kernel_size=(1, 7),
+                padding=((0, 0), (3, 3)),
+                feature_group_count=self.dim,
+                use_bias=True,
+                kernel_init=_default_kernel_init,
+                name="conv_w",
+                dtype=self.dtype,
+            )
+        else:
+            # NHWC keeps the per-channel taps of the depthwise conv contiguous;
+            # jax exposes no finer-grained layout hints to XLA than this.
+            self.conv = nn.Conv(
+                features=self.dim,
+                kernel_size=(7, 7),
+                padding=3,
+                feature_group_count=self.dim,
+                use_bias=True,
+                kernel_init=_default_kernel_init,
+                name="conv",
+                dtype=self.dtype,
+            )
+        self.norm = self.norm_cls(name="norm")
+        self.dense_0 = self.dense_cls(
+            4 * self.dim,
+            use_bias=True,
+            kernel_init=_default_kernel_init,
+            name="dense_0",
+            dtype=self.dtype,
         )
-        self.layer_scale_param = self.param(
-            "layer_scale",
-            lambda key, shape, dtype: jnp.full(shape, self.layer_scale, dtype),
-            (self.dim,),
-            self.dtype,
+        self.dense_1 = self.dense_cls(
+            self.dim,
+            use_bias=True,
+            kernel_init=_default_kernel_init,
+            name="dense_1",
+            dtype=self.dtype,
         )
+        if self.use_layer_scale:
+            self.layer_scale_param = self.param(
+                "layer_scale",
+                lambda key, shape, dtype: jnp.full(shape, self.layer_scale, dtype),
+                (self.dim,),
+                self.dtype,
+            )
         self.stochastic_depth = common.StochasticDepth(
             self.stochastic_depth_prob, scale_by_keep=True
         )
 
     def __call__(self, inputs: jnp.ndarray, is_training: bool) -> jnp.ndarray:
-        result = self.layer_scale_param * self.block(inputs)
-        result = self.stochastic_depth(result, deterministic=not is_training)
+        if self.separable_depthwise:
+            x = self.conv_w(self.conv_h(inputs))
+        else:
+            x = self.conv(inputs)
+        x = self.norm(x)
+        x = self.dense_0(x)
+        x = self.activation(x)
+        x = self.dense_1(x)
+        result = self.layer_scale_param * x if self.use_layer_scale else x
+        if is_training:
+            result = self.stochastic_depth(result, deterministic=False)
         result = inputs + result
         return result
 
@@ -90,21 +127,16 @@ class ConvNextStage(nn.Module):
     def __call__(self, inputs, is_training) -> Any:
         x = inputs
         if inputs.shape[-1] != self.channels or self.stride != 1:
-            downsample = nn.Sequential(
-                [
-                    self.norm_cls(name="downsample_norm"),
-                    nn.Conv(
-                        features=self.channels,
-                        kernel_size=(2, 2),
-                        strides=self.stride,
-                        kernel_init=_default_kernel_init,
-                        use_bias=True,
-                        name="downsample_conv",
-                        dtype=self.dtype,
-                    ),
-                ]
-            )
-            x = downsample(x)
+            x = self.norm_cls(name="downsample_norm")(x)
+            x = nn.Conv(
+                features=self.channels,
+                kernel_size=(2, 2),
+                strides=self.stride,
+                kernel_init=_default_kernel_init,
+                use_bias=True,
+                name="downsample_conv",
+                dtype=self.dtype,
+            )(x)
 
         blocks = []
         for i in range(self.num_blocks):
@@ -122,14 +154,25 @@ class ConvNextStage(nn.Module):
         return x
 
 
-def _compute_per_block_stochastic_depth_probs(
-    stochastic_depth_prob: float, num_blocks: List[int]
-) -> List[List[float]]:
-    """Computes the per-block stochastic depth probabilities."""
+@functools.lru_cache(maxsize=None)
+def _cached_per_block_stochastic_depth_probs(stochastic_depth_prob, num_blocks):
     total_stage_blocks = sum(num_blocks)
     probs = np.linspace(0, stochastic_depth_prob, total_stage_blocks)
     drop_rates = np.split(probs, np.cumsum([b for b in num_blocks]))
-    return list(map(lambda x: x.tolist(), drop_rates))[:-1]
+    return tuple(tuple(x.tolist()) for x in drop_rates[:-1])
+
+
+def _compute_per_block_stochastic_depth_probs(
+    stochastic_depth_prob: float, num_blocks: Sequence[int]
+) -> Sequence[Sequence[float]]:
+    """Computes the per-block stochastic depth probabilities.
+
+    linen re-runs ``setup`` on every init/apply, so the result is memoized on
+    the (rate, block counts) pair to do the host-side work only once.
+    """
+    return _cached_per_block_stochastic_depth_probs(
+        stochastic_depth_prob, tuple(num_blocks)
+    )
 
 
 class ConvNeXt(nn.Module):
@@ -7,36 +7,75 @@ import tree
 class CheckpointTranslator:
     def __init__(self):
         self.rules = []
+        self._dispatch = None
 
     def add(self, pattern: str):
         def register_translation_fn_decorator(fn):
             self.rules.append((re.compile(pattern + "$"), fn))
+            self._dispatch = None
             return fn
 
         return register_translation_fn_decorator
 
+    def _dispatch_pattern(self):
+        # A single alternation over all rules scans each key once instead of
+        # once per rule; the named wrapper group identifies the winning rule
+        # (alternation preserves first-match-wins registration order).
+        if self._dispatch is None:
+            self._dispatch = re.compile(
+                "|".join(
+                    f"(?P<r{i}>{pattern.pattern})"
+                    for i, (pattern, _) in enumerate(self.rules)
+                )
+            )
+        return self._dispatch
+
     def apply(self, state_dict):
         unmatched = {}
         new_dict = {}
+        dispatch = self._dispatch_pattern() if self.rules else None
         for key, value in state_dict.items():
-            matched = False
-            for pattern, rule_fn in self.rules:
-                if pattern.match(key):
-                    groups = pattern.match(key).groups()
-                    new_k, new_v = rule_fn(key, value, *groups)
-                    if new_k is not None:
-                        new_dict[new_k] = new_v
-                    matched = True
-                    break
-            if not matched:
+            match = dispatch.match(key) if dispatch is not None else None
+            if match is None:
                 unmatched[key] = value
+                continue
+            pattern, rule_fn = self.rules[int(match.lastgroup[1:])]
+            groups = pattern.match(key).groups()
+            new_k, new_v = rule_fn(key, value, *groups)
+            if new_k is not None:
+                new_dict[new_k] = new_v
         if unmatched:
-            raise ValueError(f"Unmatched keys: f{unmatched.keys()}")
+            raise ValueError(f"Unmatched keys: {unmatched.keys()}")
         return new_dict
 
 
 def as_numpy(nest):
-    return tree.map_structure(lambda x: np.asarray(x), nest)
+    """Converts a nest of array-likes to host numpy arrays without copying.
+
+    Checkpoint tensors have heterogeneous shapes, so they cannot be batched
+    into one stacked conversion; instead every leaf converts zero-copy:
+    np.asarray shares memory with CPU torch tensors and is a no-op on
+    ndarrays. detach() lets grad-requiring tensors take the same path.
+    """
+
+    def _convert(x):
+        if hasattr(x, "detach"):  # torch.Tensor
+            x = x.detach().cpu()
+        return np.asarray(x)
+
+    return tree.map_structure(_convert, nest)
+
+
+def load_safetensors_state_dict(path: str):
+    """Loads a safetensors checkpoint into host numpy arrays.
+
+    safetensors memory-maps the file and yields numpy arrays, so the
+    checkpoint is not materialized as device arrays before key translation;
+    the single host->device transfer happens after translation.
+    """
+    from safetensors import numpy as safetensors_numpy
+
+    return safetensors_numpy.load_file(path)
 
 
 def load_torch_state_dict(path: str, numpy: bool = True):
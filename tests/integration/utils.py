@@ -1,4 +1,4 @@
-from safetensors.flax import load_file
+from jam.utils import checkpoint_utils
 
 
 def get_model_dir(model_name):
@@ -6,5 +6,7 @@ def get_model_dir(model_name):
 
 
 def load_torch_pretrained_weights(model_name):
-    state_dict = load_file(f"data/models/{model_name}/torch_model.safetensors")
+    state_dict = checkpoint_utils.load_safetensors_state_dict(
+        f"data/models/{model_name}/torch_model.safetensors"
+    )
     return state_dict
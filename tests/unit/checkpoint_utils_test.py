@@ -0,0 +1,45 @@
+from absl.testing import absltest
+import numpy as np
+
+from jam.utils import checkpoint_utils
+
+
+class CheckpointTranslatorTest(absltest.TestCase):
+    def test_apply_dispatches_in_registration_order(self):
+        translator = checkpoint_utils.CheckpointTranslator()
+
+        @translator.add(r"layer.(\d+).weight")
+        def layer_weight(key, val, layer):
+            return f"layer_{layer}/kernel", val
+
+        @translator.add(r"layer.(\d+).(\w+)")
+        def layer_other(key, val, layer, slot):
+            return f"layer_{layer}/{slot}", val
+
+        @translator.add(r"dropped")
+        def dropped(key, val):
+            return None, None
+
+        translated = translator.apply(
+            {"layer.0.weight": 1, "layer.1.bias": 2, "dropped": 3}
+        )
+        self.assertEqual(translated, {"layer_0/kernel": 1, "layer_1/bias": 2})
+
+    def test_as_numpy_is_zero_copy_for_ndarrays(self):
+        value = np.ones((2, 3), np.float32)
+        converted = checkpoint_utils.as_numpy({"a": {"b": value}})
+        self.assertTrue(np.shares_memory(converted["a"]["b"], value))
+
+    def test_apply_raises_on_unmatched_keys(self):
+        translator = checkpoint_utils.CheckpointTranslator()
+
+        @translator.add(r"known")
+        def known(key, val):
+            return key, val
+
+        with self.assertRaises(ValueError):
+            translator.apply({"unknown": 1})
+
+
+if __name__ == "__main__":
+    absltest.main()
@@ -2,6 +2,7 @@ from absl.testing import absltest
 import chex
 import jax
 import jax.numpy as jnp
+import numpy as np
 
 from jam.flax import common
 
@@ -15,9 +16,9 @@ class CommonTest(absltest.TestCase):
         )
         chex.assert_equal_shape([inputs, outputs])
 
-        # Evaluation does not require rng.
+        # Evaluation does not require rng and is the identity.
         outputs = sd.apply({}, inputs, deterministic=True)
-        chex.assert_equal_shape([inputs, outputs])
+        np.testing.assert_array_equal(outputs, inputs)
 
         # Evaluation does not require rng.
         sd = common.StochasticDepth(0.0)
@@ -30,6 +31,32 @@ class CommonTest(absltest.TestCase):
         with self.assertRaises(ValueError):
             common.StochasticDepth(1.2)
 
+    def test_int8_dense(self):
+        kernel = jax.random.normal(jax.random.PRNGKey(0), (16, 8))
+        bias = jax.random.normal(jax.random.PRNGKey(1), (8,))
+        quantized, scale = common.quantize_kernel_int8(kernel)
+        self.assertEqual(quantized.dtype, jnp.int8)
+
+        inputs = jax.random.normal(jax.random.PRNGKey(2), (4, 16))
+        dense = common.Int8Dense(8)
+        outputs = dense.apply(
+            {"params": {"kernel": quantized, "scale": scale, "bias": bias}}, inputs
+        )
+        expected = inputs @ kernel + bias
+        np.testing.assert_allclose(outputs, expected, atol=0.05)
+
+    def test_int8_dense_init_is_coherent(self):
+        dense = common.Int8Dense(8)
+        inputs = jax.random.normal(jax.random.PRNGKey(0), (4, 16))
+        variables = dense.init(jax.random.PRNGKey(1), inputs)
+        params = variables["params"]
+        self.assertEqual(params["kernel"].dtype, jnp.int8)
+        np.testing.assert_allclose(params["scale"], np.full((8,), 1.0 / 127.0))
+        # Effective weights are the (coarsely) quantized kernel_init draw,
+        # bounded by +-1, so fresh-init outputs stay O(1).
+        outputs = dense.apply(variables, inputs)
+        self.assertLess(float(jnp.max(jnp.abs(outputs))), 16.0)
+
 
 if __name__ == "__main__":
     absltest.main()
@@ -1,6 +1,9 @@
+import functools
+
 from absl.testing import absltest
 import chex
 import flax
+from flax import linen as nn
 import jax
 import jax.numpy as jnp
 import numpy as np
@@ -33,6 +36,95 @@ class FlaxConvNeXTTest(absltest.TestCase):
         inputs = jnp.ones((1, 224, 224, 3), dtype=jnp.float32)
         variables = net.init(jax.random.PRNGKey(0), inputs, False)
 
+    def test_separable_depthwise_block(self):
+        block = convnext.ConvNeXtBlock(8, 1e-6, 0.0, separable_depthwise=True)
+        inputs = jnp.ones((1, 16, 16, 8))
+        variables = block.init(jax.random.PRNGKey(0), inputs, False)
+        params = variables["params"]
+        self.assertIn("conv_h", params)
+        self.assertIn("conv_w", params)
+        outputs = block.apply(variables, inputs, False)
+        chex.assert_equal_shape([inputs, outputs])
+
+    def test_quantize_block_dense_params(self):
+        variables = {
+            "params": {
+                "stage_0": {
+                    "block_0": {
+                        "dense_0": {
+                            "kernel": np.ones((16, 64), np.float32),
+                            "bias": np.zeros((64,), np.float32),
+                        }
+                    }
+                },
+                "head": {"kernel": np.ones((16, 10), np.float32)},
+            }
+        }
+        quantized = convnext.quantize_block_dense_params(variables)
+        dense = quantized["params"]["stage_0"]["block_0"]["dense_0"]
+        self.assertEqual(dense["kernel"].dtype, jnp.int8)
+        chex.assert_shape(dense["scale"], (64,))
+        self.assertEqual(quantized["params"]["head"]["kernel"].dtype, jnp.float32)
+
+    def test_fold_layernorm_into_block_dense(self):
+        net = convnext.ConvNeXt([convnext.convnext.CNBlockConfig(8, 2)])
+        inputs = jax.random.normal(jax.random.PRNGKey(0), (2, 16, 16, 3))
+        variables = net.init(jax.random.PRNGKey(1), inputs, False)
+
+        # Init leaves the norm affine at identity; randomize it so the fold
+        # has something to do.
+        flat = flax.traverse_util.flatten_dict(variables["params"], sep="/")
+        for key in flat:
+            if "block_" in key and "/norm/" in key:
+                flat[key] = np.asarray(
+                    jax.random.normal(
+                        jax.random.PRNGKey(hash(key) % 100), flat[key].shape
+                    )
+                )
+        variables = {"params": flax.traverse_util.unflatten_dict(flat, sep="/")}
+
+        folded = convnext.fold_layernorm_into_block_dense(variables)
+        self.assertNotIn("norm", folded["params"]["stage_0"]["block_0"])
+
+        folded_net = convnext.ConvNeXt(
+            [convnext.convnext.CNBlockConfig(8, 2)],
+            block_cls=functools.partial(
+                convnext.ConvNeXtBlock,
+                norm_cls=functools.partial(
+                    nn.LayerNorm, epsilon=1e-6, use_scale=False, use_bias=False
+                ),
+            ),
+        )
+        expected = net.apply(variables, inputs, False)
+        outputs = folded_net.apply(folded, inputs, False)
+        np.testing.assert_allclose(outputs, expected, atol=1e-5)
+
+    def test_fuse_layer_scale(self):
+        net = convnext.ConvNeXt([convnext.convnext.CNBlockConfig(8, 2)])
+        inputs = jax.random.normal(jax.random.PRNGKey(0), (2, 16, 16, 3))
+        variables = net.init(jax.random.PRNGKey(1), inputs, False)
+
+        fused = convnext.fuse_layer_scale(variables)
+        self.assertNotIn("layer_scale", fused["params"]["stage_0"]["block_0"])
+
+        fused_net = convnext.ConvNeXt(
+            [convnext.convnext.CNBlockConfig(8, 2)],
+            block_cls=functools.partial(convnext.ConvNeXtBlock, use_layer_scale=False),
+        )
+        expected = net.apply(variables, inputs, False)
+        outputs = fused_net.apply(fused, inputs, False)
+        np.testing.assert_allclose(outputs, expected, atol=1e-6)
+
+    def test_load_from_torch_checkpoint_dtype(self):
+        state_dict = {
+            "classifier.0.weight": np.ones((768,), np.float32),
+            "classifier.2.weight": np.zeros((1000, 768), np.float32),
+        }
+        variables = convnext.load_from_torch_checkpoint(state_dict, dtype=jnp.bfloat16)
+        self.assertEqual(variables["params"]["head"]["kernel"].dtype, jnp.bfloat16)
+        # Norm params are precision-sensitive and stay in fp32.
+        self.assertEqual(variables["params"]["norm"]["scale"].dtype, jnp.float32)
+
 
 if __name__ == "__main__":
     absltest.main()